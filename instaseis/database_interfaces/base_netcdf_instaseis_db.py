@@ -38,11 +38,16 @@ ElementInfo = collections.namedtuple(
         "col_points_eta",
         "axis",
         "eltype",
+        "center_gll_id",
     ],
 )
 
 Coordinates = collections.namedtuple("Coordinates", ["s", "phi", "z"])
 
+MeshCollection_merged = collections.namedtuple(
+    "MeshCollection_merged", ["merged"]
+)
+
 
 class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
     """
@@ -75,6 +80,12 @@ class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
             useful e.g. for finite sources, default).
         :type read_on_demand: bool, optional
         """
+        # Consumed by the databases supporting it.
+        if kwargs.pop("fp32", False):
+            raise NotImplementedError(
+                "Single precision extraction is only supported for merged "
+                "forward databases."
+            )
         self.db_path = db_path
         self.buffer_size_in_mb = buffer_size_in_mb
         self.read_on_demand = read_on_demand
@@ -154,6 +165,11 @@ class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
                 gll_point_ids = mesh["sem_mesh"][id_elem]
                 axis = bool(mesh["axis"][id_elem])
 
+            # The GLL point in the center of the element, e.g. used to get
+            # the elastic parameters of the element.
+            npol_mid = self.parsed_mesh.npol // 2
+            center_gll_id = gll_point_ids[npol_mid, npol_mid]
+
             if axis:
                 col_points_xi = self.parsed_mesh.glj_points
                 col_points_eta = self.parsed_mesh.gll_points
@@ -165,6 +181,7 @@ class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
             col_points_xi = None
             col_points_eta = None
             gll_point_ids = None
+            center_gll_id = None
             axis = None
             corner_points = None
             eltype = None
@@ -181,6 +198,7 @@ class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
             col_points_eta=col_points_eta,
             axis=axis,
             eltype=eltype,
+            center_gll_id=center_gll_id,
         )
 
     @abstractmethod
@@ -202,18 +220,10 @@ class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
-    def _get_seismograms(self, source, receiver, components=("Z", "N", "E")):
+    def _get_coordinates(self, source, receiver):
         """
-        Extract seismograms from a netCDF based Instaseis database.
-
-        :type source: :class:`instaseis.source.Source` or
-            :class:`instaseis.source.ForceSource`
-        :param source: The source.
-        :type receiver: :class:`instaseis.source.Receiver`
-        :param receiver: The receiver.
-        :type components: tuple
-        :param components: The requests components. Any combinations of
-            ``"Z"``, ``"N"``, ``"E"``, ``"R"``, and ``"T"``
+        Coordinates of the point of interest in the frame of the simulation,
+        e.g. of the source for reciprocal databases.
         """
         if self.info.is_reciprocal:
             a, b = source, receiver
@@ -228,7 +238,22 @@ class BaseNetCDFInstaseisDB(BaseInstaseisDB, metaclass=ABCMeta):
             b.colatitude,
         )
 
-        coordinates = Coordinates(s=rotmesh_s, phi=rotmesh_phi, z=rotmesh_z)
+        return Coordinates(s=rotmesh_s, phi=rotmesh_phi, z=rotmesh_z)
+
+    def _get_seismograms(self, source, receiver, components=("Z", "N", "E")):
+        """
+        Extract seismograms from a netCDF based Instaseis database.
+
+        :type source: :class:`instaseis.source.Source` or
+            :class:`instaseis.source.ForceSource`
+        :param source: The source.
+        :type receiver: :class:`instaseis.source.Receiver`
+        :param receiver: The receiver.
+        :type components: tuple
+        :param components: The requests components. Any combinations of
+            ``"Z"``, ``"N"``, ``"E"``, ``"R"``, and ``"T"``
+        """
+        coordinates = self._get_coordinates(source=source, receiver=receiver)
 
         element_info = self._get_element_info(coordinates=coordinates)
 
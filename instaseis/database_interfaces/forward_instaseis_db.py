@@ -20,6 +20,11 @@ from .. import rotations
 from ..source import Source
 
 
+MeshCollection_fwd = collections.namedtuple(
+    "MeshCollection_fwd", ["m1", "m2", "m3", "m4"]
+)
+
+
 class ForwardInstaseisDB(BaseNetCDFInstaseisDB):
     """
     Forward Instaseis database.
@@ -92,9 +97,6 @@ class ForwardInstaseisDB(BaseNetCDFInstaseisDB):
         )
         self.parsed_mesh = m1_m
 
-        MeshCollection_fwd = collections.namedtuple(
-            "MeshCollection_fwd", ["m1", "m2", "m3", "m4"]
-        )
         self.meshes = MeshCollection_fwd(m1_m, m2_m, m3_m, m4_m)
 
         self._is_reciprocal = False
@@ -114,8 +116,7 @@ class ForwardInstaseisDB(BaseNetCDFInstaseisDB):
         else:
             mesh_mu = mesh["mesh_mu"]
 
-        npol = self.info.spatial_order
-        data["mu"] = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
+        data["mu"] = mesh_mu[ei.center_gll_id]
 
         if not isinstance(source, Source):
             raise NotImplementedError
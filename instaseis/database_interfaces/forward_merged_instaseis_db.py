@@ -12,14 +12,138 @@ AxiSEM.
     (http://www.gnu.org/copyleft/lgpl.html)
 """
 import collections
+import functools
+
 import numpy as np
 
-from .base_netcdf_instaseis_db import BaseNetCDFInstaseisDB
+from .base_netcdf_instaseis_db import (
+    BaseNetCDFInstaseisDB,
+    MeshCollection_merged,
+)
 from . import mesh
 from .. import rotations, spectral_basis
 from ..source import Source
 
 
+# The ten variables of a merged forward database grouped by the elemental
+# moment tensor they have been generated from: MZZ, MXX+MYY, MXZ/MYZ, and
+# MXY/MXX-MYY.
+VARIABLE_GROUPS = (slice(0, 2), slice(2, 4), slice(4, 7), slice(7, 10))
+
+
+def _active_variable_groups(mij):
+    """
+    Returns the variable groups contributing to the displacement of the
+    given moment tensor. Groups multiplied by zero for every component, e.g.
+    all but the first two for an explosion, don't have to be interpolated.
+    """
+    active = (
+        mij[0] != 0,
+        mij[1] + mij[2] != 0,
+        mij[3] != 0 or mij[4] != 0,
+        mij[1] - mij[2] != 0 or mij[5] != 0,
+    )
+    return [group for group, a in zip(VARIABLE_GROUPS, active) if a]
+
+
+Phase = collections.namedtuple(
+    "Phase", ["cos_phi", "sin_phi", "cos_2phi", "sin_2phi"]
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_phase(phi):
+    """
+    Trigonometric factors of the azimuth needed to combine the moment tensor
+    components. Cached as they are invariant for a fixed source-receiver
+    geometry.
+    """
+    two_phi = 2.0 * phi
+    return Phase(
+        cos_phi=np.cos(phi),
+        sin_phi=np.sin(phi),
+        cos_2phi=np.cos(two_phi),
+        sin_2phi=np.sin(two_phi),
+    )
+
+
+def _mt_coefficients(mij, cos_phi, sin_phi, cos_2phi, sin_2phi):
+    """
+    Returns the ``(10, 3)`` matrix mapping the ten variables of a merged
+    forward database to the displacement in s, phi, z coordinates caused by
+    the moment tensor ``mij`` (``[m_rr, m_tt, m_pp, m_rt, m_rp, m_tp]``,
+    scaled by the amplitude of the database).
+    """
+    coeffs = np.zeros((10, 3), dtype=np.float64)
+
+    # Variables 0 and 1 are generated from MZZ which has only two
+    # displacement components.
+    coeffs[0, 0] = coeffs[1, 2] = mij[0]
+
+    # Variables 2 and 3 are generated from MXX+MYY which has only two
+    # displacement components.
+    coeffs[2, 0] = coeffs[3, 2] = mij[1] + mij[2]
+
+    # Variables 4 to 6 are generated from MXZ/MYZ which has three
+    # displacement components.
+    fac_1 = mij[3] * cos_phi + mij[4] * sin_phi
+    fac_2 = -mij[3] * sin_phi + mij[4] * cos_phi
+    coeffs[4, 0] = coeffs[6, 2] = fac_1
+    coeffs[5, 1] = fac_2
+
+    # Variables 7 to 9 are generated from MXY/MXX-MYY which has three
+    # displacement components.
+    fac_1 = (mij[1] - mij[2]) * cos_2phi + 2.0 * mij[5] * sin_2phi
+    fac_2 = -(mij[1] - mij[2]) * sin_2phi + 2.0 * mij[5] * cos_2phi
+    coeffs[7, 0] = coeffs[9, 2] = fac_1
+    coeffs[8, 1] = fac_2
+
+    return coeffs
+
+
+def _combine_mt(
+    interp,
+    mij,
+    cos_phi,
+    sin_phi,
+    cos_2phi,
+    sin_2phi,
+    out,
+    projection=None,
+    variables=None,
+):
+    """
+    Combine the ten interpolated variables of a merged forward database to
+    the displacement caused by a moment tensor source.
+
+    All contributions are linear in the interpolated variables so they are
+    collected in a small coefficient matrix and applied in a single matrix
+    product, reading ``interp`` and writing ``out`` exactly once.
+
+    :param interp: The interpolated variables with shape ``(nvar, npts)``.
+        The computation is carried out in its precision.
+    :param mij: The moment tensor ``[m_rr, m_tt, m_pp, m_rt, m_rp, m_tp]``
+        scaled by the amplitude of the database.
+    :param out: C-contiguous ``(ncomp, npts)`` output array.
+    :param projection: Optional ``(3, ncomp)`` matrix mapping the
+        displacement in s, phi, z coordinates to the desired output
+        components. It is folded into the coefficients so rotations do not
+        require another pass over the data. If not given, ``out`` will
+        contain the displacement in s, phi, z coordinates.
+    :param variables: The indices of the variables contained in ``interp``.
+        Defaults to all ten.
+    """
+    coeffs = _mt_coefficients(mij, cos_phi, sin_phi, cos_2phi, sin_2phi)
+
+    if variables is not None:
+        coeffs = coeffs[variables]
+    if projection is not None:
+        coeffs = np.dot(coeffs, projection)
+
+    coeffs = np.require(coeffs.T, dtype=interp.dtype)
+    return np.dot(coeffs, interp, out=out)
+
+
 class ForwardMergedInstaseisDB(BaseNetCDFInstaseisDB):
     """
     Merged forward Instaseis database.
@@ -31,6 +155,7 @@ class ForwardMergedInstaseisDB(BaseNetCDFInstaseisDB):
         netcdf_file,
         buffer_size_in_mb=100,
         read_on_demand=False,
+        fp32=False,
         *args,
         **kwargs,
     ):
@@ -50,6 +175,14 @@ class ForwardMergedInstaseisDB(BaseNetCDFInstaseisDB):
             initialization, faster in individual seismogram extraction,
             useful e.g. for finite sources, default).
         :type read_on_demand: bool, optional
+        :param fp32: Perform the interpolation and the combination of the
+            wavefields in single instead of double precision. The merged
+            database is stored in single precision so this halves the
+            memory traffic at the cost of some accuracy. Only the
+            extraction from the database is affected - the seismograms are
+            not guaranteed to be single precision, e.g. resampled traces
+            are returned in double precision.
+        :type fp32: bool, optional
         """
         BaseNetCDFInstaseisDB.__init__(
             self,
@@ -59,14 +192,10 @@ class ForwardMergedInstaseisDB(BaseNetCDFInstaseisDB):
             *args,
             **kwargs,
         )
+        self.dtype = np.float32 if fp32 else np.float64
         self._parse_mesh(netcdf_file)
 
     def _parse_mesh(self, filename):
-
-        MeshCollection_merged = collections.namedtuple(
-            "MeshCollection_merged", ["merged"]
-        )
-
         self.meshes = MeshCollection_merged(
             mesh.Mesh(
                 filename,
@@ -80,6 +209,48 @@ class ForwardMergedInstaseisDB(BaseNetCDFInstaseisDB):
 
         self._is_reciprocal = False
 
+    def _get_mu(self, element_info):
+        if not self.read_on_demand:
+            mesh_mu = self.parsed_mesh.mesh_mu
+        else:
+            mesh_mu = self.parsed_mesh.f["Mesh"]["mesh_mu"]
+
+        return mesh_mu[element_info.center_gll_id]
+
+    def _get_projection(self, source, receiver, components, coordinates):
+        """
+        Every output component is a linear combination of the displacement
+        in s, phi, z coordinates. Collect them in a single ``(3, ncomp)``
+        projection matrix so all components can be computed in one pass.
+        """
+        projection = np.empty((3, len(components)), dtype=np.float64)
+        if "N" in components or "E" in components or "Z" in components:
+            rotmat = rotations.rotmat_src_to_NEZ(
+                coordinates.phi,
+                source.longitude_rad,
+                source.colatitude_rad,
+                receiver.longitude_rad,
+                receiver.colatitude_rad,
+            )
+        if "R" in components:
+            rotmesh_colat = np.arctan2(coordinates.s, coordinates.z)
+
+        for _i, comp in enumerate(components):
+            if comp == "T":
+                # need the - for consistency with reciprocal mode,
+                # need external verification still
+                projection[:, _i] = [0.0, -1.0, 0.0]
+            elif comp == "R":
+                projection[:, _i] = [
+                    np.cos(rotmesh_colat),
+                    0.0,
+                    -np.sin(rotmesh_colat),
+                ]
+            else:
+                projection[:, _i] = rotmat["NEZ".index(comp)]
+
+        return projection
+
     def _get_data(
         self, source, receiver, components, coordinates, element_info
     ):
@@ -87,185 +258,155 @@ class ForwardMergedInstaseisDB(BaseNetCDFInstaseisDB):
         # Collect data arrays and mu in a dictionary.
         data = {}
 
-        mesh = self.parsed_mesh.f["Mesh"]
-
-        # Get mu.
-        if not self.read_on_demand:
-            mesh_mu = self.parsed_mesh.mesh_mu
-        else:
-            mesh_mu = mesh["mesh_mu"]
-
-        npol = self.info.spatial_order
-        data["mu"] = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
+        data["mu"] = self._get_mu(ei)
 
         if not isinstance(source, Source):
             raise NotImplementedError
         if self.info.dump_type != "displ_only":
             raise NotImplementedError
 
-        # Get from netcdf file or buffer.
-        if ei.id_elem not in self.parsed_mesh.displ_buffer:
-            utemp = self.meshes.merged.f["MergedSnapshots"][ei.id_elem]
-
-            # utemp is currently (nvars, jpol, ipol, npts)
-            # 1. Roll to (npts, nvar, jpol, ipol)
-            utemp = np.rollaxis(utemp, 3, 0)
-            # 2. Roll to (npts, jpol, nvar, ipol)
-            utemp = np.rollaxis(utemp, 2, 1)
-            # 3. Roll to (npts, jpol, ipol, nvar)
-            utemp = np.rollaxis(utemp, 3, 2)
+        # Get from netcdf file or buffer. The element is stored as
+        # (jpol, ipol, nvar, npts).
+        utemp = self.parsed_mesh.get_merged_element(ei.id_elem)
 
-            self.parsed_mesh.displ_buffer.add(ei.id_elem, utemp)
-        else:
-            utemp = self.parsed_mesh.displ_buffer.get(ei.id_elem)
-
-        displ_1 = np.zeros((utemp.shape[0], 3), order="F")
-        displ_2 = np.zeros((utemp.shape[0], 3), order="F")
-        displ_3 = np.zeros((utemp.shape[0], 3), order="F")
-        displ_4 = np.zeros((utemp.shape[0], 3), order="F")
-
-        # Now just fill them all.
-        # displ_1 is generated from MZZ which has only two displacement
-        # components.
-        displ_1[:, 0] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 0],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        displ_1[:, 2] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 1],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        # displ_2 is generated from MXX+MYY which has only two displacement
-        # components.
-        displ_2[:, 0] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 2],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        displ_2[:, 2] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 3],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        # displ_3 is generated from MXZ/MYZ which has three displacement
-        # components.
-        displ_3[:, 0] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 4],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        displ_3[:, 1] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 5],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        displ_3[:, 2] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 6],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        # displ_3 is generated from MXY/MXX-MYY which has three displacement
-        # components.
-        displ_4[:, 0] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 7],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        displ_4[:, 1] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 8],
-            x1=ei.xi,
-            x2=ei.eta,
-        )
-        displ_4[:, 2] = spectral_basis.lagrange_interpol_2D_td(
-            points1=ei.col_points_xi,
-            points2=ei.col_points_eta,
-            coefficients=utemp[:, :, :, 9],
-            x1=ei.xi,
-            x2=ei.eta,
+        # The Lagrange basis at (xi, eta) is the same for all ten variables
+        # so it only has to be evaluated once. As in
+        # lagrange_interpol_2D_td() the first spatial axis of utemp is paired
+        # with xi and the second one with eta.
+        wxi, weta = spectral_basis.lagrange_weights(
+            ei.col_points_xi, ei.col_points_eta, ei.xi, ei.eta
         )
+        wxi = wxi.astype(self.dtype, copy=False)
+        weta = weta.astype(self.dtype, copy=False)
 
         mij = source.tensor / self.parsed_mesh.amplitude
-        # mij is [m_rr, m_tt, m_pp, m_rt, m_rp, m_tp]
-        # final is in s, phi, z coordinates
-        final = np.zeros((displ_1.shape[0], 3), dtype="float64")
-
-        final[:, 0] += displ_1[:, 0] * mij[0]
-        final[:, 2] += displ_1[:, 2] * mij[0]
-
-        final[:, 0] += displ_2[:, 0] * (mij[1] + mij[2])
-        final[:, 2] += displ_2[:, 2] * (mij[1] + mij[2])
-
-        fac_1 = mij[3] * np.cos(coordinates.phi) + mij[4] * np.sin(
-            coordinates.phi
-        )
-        fac_2 = -mij[3] * np.sin(coordinates.phi) + mij[4] * np.cos(
-            coordinates.phi
+        phase = _cached_phase(coordinates.phi)
+
+        # Only interpolate the variables actually contributing to the
+        # displacement of this source.
+        groups = _active_variable_groups(mij)
+        variables = [_i for g in groups for _i in range(g.start, g.stop)]
+
+        # Interpolate the variables straight into a single (nvar, npts)
+        # array with contiguous time series for each variable.
+        npts = utemp.shape[-1]
+        interp = np.empty((len(variables), npts), dtype=self.dtype)
+        row = 0
+        for g in groups:
+            n = g.stop - g.start
+            spectral_basis.lagrange_weighted_sum(
+                wxi, weta, utemp[:, :, g], out=interp[row : row + n]  # NOQA
+            )
+            row += n
+
+        final = np.empty((len(components), npts), dtype=self.dtype)
+        _combine_mt(
+            interp,
+            mij,
+            *phase,
+            out=final,
+            projection=self._get_projection(
+                source, receiver, components, coordinates
+            ),
+            variables=variables,
         )
 
-        final[:, 0] += displ_3[:, 0] * fac_1
-        final[:, 1] += displ_3[:, 1] * fac_2
-        final[:, 2] += displ_3[:, 2] * fac_1
+        for _i, comp in enumerate(components):
+            data[comp] = final[_i]
 
-        fac_1 = (mij[1] - mij[2]) * np.cos(2 * coordinates.phi) + 2 * mij[
-            5
-        ] * np.sin(2 * coordinates.phi)
-        fac_2 = -(mij[1] - mij[2]) * np.sin(2 * coordinates.phi) + 2 * mij[
-            5
-        ] * np.cos(2 * coordinates.phi)
-
-        final[:, 0] += displ_4[:, 0] * fac_1
-        final[:, 1] += displ_4[:, 1] * fac_2
-        final[:, 2] += displ_4[:, 2] * fac_1
+        return data
 
-        rotmesh_colat = np.arctan2(coordinates.s, coordinates.z)
+    def _get_data_batch(
+        self, sources, receiver, components, coordinates, element_info
+    ):
+        """
+        Batched version of :meth:`_get_data` for many sources and a single
+        receiver, e.g. the point sources of a finite source.
+
+        Sources are grouped by the element they fall into. Each element is
+        read and interpolated only once for all its sources.
+
+        :param sources: List of sources.
+        :param receiver: The receiver.
+        :param components: The requested components.
+        :param coordinates: List with the coordinates of the receiver in the
+            frame of each source.
+        :param element_info: List with the element information of each
+            source-receiver pair.
+
+        :returns: Dictionary with ``(nsources, npts)`` arrays for every
+            component and the ``(nsources,)`` values of ``"mu"``. Sum over
+            the first axis to get the finite source seismograms.
+        """
+        if not sources:
+            raise ValueError("At least one source is required.")
+        if not len(sources) == len(coordinates) == len(element_info):
+            raise ValueError(
+                "sources, coordinates, and element_info must have the same "
+                "length."
+            )
+        if not all(isinstance(src, Source) for src in sources):
+            raise NotImplementedError
+        if self.info.dump_type != "displ_only":
+            raise NotImplementedError
 
-        if "T" in components:
-            # need the - for consistency with reciprocal mode,
-            # need external verification still
-            data["T"] = -final[:, 1]
+        nsources = len(sources)
+        ncomp = len(components)
 
-        if "R" in components:
-            data["R"] = final[:, 0] * np.cos(rotmesh_colat) - final[
-                :, 2
-            ] * np.sin(rotmesh_colat)
+        mu = np.array([self._get_mu(ei) for ei in element_info])
 
-        if "N" in components or "E" in components or "Z" in components:
-            # transpose needed because rotations assume different slicing
-            # (ugly)
-            final = rotations.rotate_vector_src_to_NEZ(
-                final.T,
-                coordinates.phi,
-                source.longitude_rad,
-                source.colatitude_rad,
-                receiver.longitude_rad,
-                receiver.colatitude_rad,
+        # Combination coefficients of each source, (nsources, ncomp, 10).
+        coeffs = np.empty((nsources, ncomp, 10), dtype=np.float64)
+        for _i, (src, coords) in enumerate(zip(sources, coordinates)):
+            c = _mt_coefficients(
+                src.tensor / self.parsed_mesh.amplitude,
+                *_cached_phase(coords.phi),
+            )
+            coeffs[_i] = np.dot(
+                c, self._get_projection(src, receiver, components, coords)
             ).T
 
-            if "N" in components:
-                data["N"] = final[:, 0]
-            if "E" in components:
-                data["E"] = final[:, 1]
-            if "Z" in components:
-                data["Z"] = final[:, 2]
+        by_element = collections.defaultdict(list)
+        for _i, ei in enumerate(element_info):
+            by_element[ei.id_elem].append(_i)
+
+        final = None
+        for id_elem, indices in by_element.items():
+            utemp = self.parsed_mesh.get_merged_element(id_elem)
+            if final is None:
+                final = np.empty(
+                    (nsources, ncomp, utemp.shape[-1]), dtype=self.dtype
+                )
+
+            w = [
+                spectral_basis.lagrange_weights(
+                    element_info[_i].col_points_xi,
+                    element_info[_i].col_points_eta,
+                    element_info[_i].xi,
+                    element_info[_i].eta,
+                )
+                for _i in indices
+            ]
+            # The 2D weights of all sources in this element,
+            # (nbatch, (jpol + 1) * (ipol + 1)).
+            weights = np.array(
+                [np.multiply.outer(*_w).reshape(-1) for _w in w],
+                dtype=self.dtype,
+            )
+
+            # Interpolate all sources with a single GEMM over the flattened
+            # collocation points, (nbatch, nvar, npts).
+            interp = np.dot(
+                weights,
+                utemp.astype(self.dtype, copy=False).reshape(
+                    weights.shape[1], -1
+                ),
+            ).reshape((len(indices),) + utemp.shape[2:])
+            final[indices] = np.matmul(
+                coeffs[indices].astype(self.dtype, copy=False), interp
+            )
 
+        data = {"mu": mu}
+        for _i, comp in enumerate(components):
+            data[comp] = final[:, _i]
         return data
@@ -22,6 +22,7 @@ instead of
     (http://www.gnu.org/copyleft/lgpl.html)
 """
 from collections import OrderedDict
+import threading
 
 import h5py
 import numpy as np
@@ -73,6 +74,9 @@ class Buffer(object):
         Add an item to the buffer and make sure that the buffer does not exceed
         the maximum size in memory.
         """
+        # Replacing an existing item must not count its size twice.
+        if key in self._buffer:
+            self._total_size -= self._get_nbytes(self._buffer.pop(key))
         self._buffer[key] = value
         # Assuming value is a numpy array
         self._total_size += self._get_nbytes(value)
@@ -141,6 +145,8 @@ class Mesh(object):
         self._find_time_axis()
         self.strain_buffer = Buffer(strain_buffer_size_in_mb)
         self.displ_buffer = Buffer(displ_buffer_size_in_mb)
+        # The server extracts seismograms from multiple threads.
+        self._buffer_lock = threading.Lock()
 
     def _get_str_attr(self, name):
         attr = self.f.attrs[name]
@@ -151,6 +157,61 @@ class Mesh(object):
         except Exception:
             return attr
 
+    def read_element(self, id_elem):
+        """
+        Read a single element from the ``MergedSnapshots`` dataset of a
+        merged database.
+
+        The data is stored as ``(nvar, jpol, ipol, npts)`` on disc. It is
+        repacked to a C-contiguous ``(jpol, ipol, nvar, npts)`` array so the
+        time series of every variable at every GLL point is a contiguous
+        block of memory.
+
+        :param id_elem: The id of the element.
+        """
+        utemp = self.f["MergedSnapshots"][id_elem]
+        return np.ascontiguousarray(utemp.transpose(1, 2, 0, 3))
+
+    def _get_buffered(self, buffer, key, load):
+        """
+        Get an item from one of the buffers or create it with ``load()`` and
+        add it if it is not buffered yet. Safe to call from multiple threads.
+        """
+        with self._buffer_lock:
+            if key in buffer:
+                return buffer.get(key)
+
+        # Don't hold the lock while reading.
+        value = load()
+
+        with self._buffer_lock:
+            buffer.add(key, value)
+        return value
+
+    def get_merged_element(self, id_elem):
+        """
+        Get a repacked element of a merged database (see
+        :meth:`read_element`) from the displacement buffer or read it if it
+        is not buffered yet. Safe to call from multiple threads.
+
+        The returned array is shared with the buffer and must not be
+        modified.
+        """
+        return self._get_buffered(
+            self.displ_buffer, id_elem, lambda: self.read_element(id_elem)
+        )
+
+    def get_strain(self, id_elem, compute):
+        """
+        Get the strain of an element from the strain buffer or compute it
+        with ``compute()`` if it is not buffered yet. Safe to call from
+        multiple threads.
+
+        The returned value is shared with the buffer and must not be
+        modified.
+        """
+        return self._get_buffered(self.strain_buffer, id_elem, compute)
+
     def _find_time_axis(self):
         # Merged databases are always the same and don't have a Snapshots key.
         if "Snapshots" not in self.f:
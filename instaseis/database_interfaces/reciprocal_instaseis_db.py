@@ -20,6 +20,9 @@ from .. import rotations
 from ..source import Source, ForceSource
 
 
+MeshCollection_bwd = collections.namedtuple("MeshCollection_bwd", ["px", "pz"])
+
+
 class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
     """
     Reciprocal Instaseis database.
@@ -114,9 +117,6 @@ class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
             # Should not happen.
             raise NotImplementedError
 
-        MeshCollection_bwd = collections.namedtuple(
-            "MeshCollection_bwd", ["px", "pz"]
-        )
         self.meshes = MeshCollection_bwd(px=px_m, pz=pz_m)
 
         self._is_reciprocal = True
@@ -136,8 +136,7 @@ class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
         else:
             mesh_mu = mesh["mesh_mu"]
         if self.info.dump_type == "displ_only":
-            npol = self.info.spatial_order
-            mu = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
+            mu = mesh_mu[ei.center_gll_id]
         else:
             # XXX: Is this correct?
             mu = mesh_mu[ei.id_elem]
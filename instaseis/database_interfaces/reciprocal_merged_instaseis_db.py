@@ -11,15 +11,35 @@ AxiSEM.
     GNU Lesser General Public License, Version 3 [non-commercial/academic use]
     (http://www.gnu.org/copyleft/lgpl.html)
 """
-import collections
 import numpy as np
 
-from .base_netcdf_instaseis_db import BaseNetCDFInstaseisDB
+from .base_netcdf_instaseis_db import (
+    BaseNetCDFInstaseisDB,
+    MeshCollection_merged,
+)
 from . import mesh
 from .. import rotations, sem_derivatives, spectral_basis
 from ..source import Source, ForceSource
 
 
+def _apply_weights(values, weights):
+    """
+    Compute several components as weighted sums of the columns of the same
+    array in a single matrix product, i.e. a single blocked pass over the
+    data.
+
+    :param values: The ``(npts, n)`` array, e.g. interpolated strain.
+    :param weights: Dictionary mapping component names to ``(n,)`` weights.
+    :returns: Dictionary mapping component names to contiguous ``(npts,)``
+        arrays.
+    """
+    if not weights:
+        return {}
+    comps = list(weights.keys())
+    result = np.dot(np.array([weights[_c] for _c in comps]), values.T)
+    return dict(zip(comps, result))
+
+
 class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
     """
     Reciprocal Merged Instaseis Database.
@@ -62,11 +82,6 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
         self._parse_mesh(netcdf_file)
 
     def _parse_mesh(self, filename):
-
-        MeshCollection_merged = collections.namedtuple(
-            "MeshCollection_merged", ["merged"]
-        )
-
         self.meshes = MeshCollection_merged(
             mesh.Mesh(
                 filename,
@@ -95,8 +110,7 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
         else:
             mesh_mu = mesh["mesh_mu"]
         if self.info.dump_type == "displ_only":
-            npol = self.info.spatial_order
-            mu = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
+            mu = mesh_mu[ei.center_gll_id]
         else:  # pragma: no cover
             # Merged databases currently not implemented for
             # non-displacement databases.
@@ -154,26 +168,20 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
             )
             mij /= self.parsed_mesh.amplitude
 
+            # Every component is a weighted sum of the strain components.
+            # Apply the weights with matrix products instead of
+            # accumulating a temporary array per term. All horizontal
+            # components are computed in a single pass over strain_x.
             if "Z" in components:
-                final = np.zeros(strain_z.shape[0], dtype="float64")
-                for i in range(3):
-                    final += mij[i] * strain_z[:, i]
-                final += 2.0 * mij[4] * strain_z[:, 4]
-                data["Z"] = final
+                weights = mij * [1.0, 1.0, 1.0, 0.0, 2.0, 0.0]
+                data["Z"] = np.dot(strain_z, weights)
 
+            horizontal = {}
             if "R" in components:
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final -= strain_x[:, 0] * mij[0] * 1.0
-                final -= strain_x[:, 1] * mij[1] * 1.0
-                final -= strain_x[:, 2] * mij[2] * 1.0
-                final -= strain_x[:, 4] * mij[4] * 2.0
-                data["R"] = final
+                horizontal["R"] = mij * [-1.0, -1.0, -1.0, 0.0, -2.0, 0.0]
 
             if "T" in components:
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final += strain_x[:, 3] * mij[3] * 2.0
-                final += strain_x[:, 5] * mij[5] * 2.0
-                data["T"] = final
+                horizontal["T"] = mij * [0.0, 0.0, 0.0, 2.0, 0.0, 2.0]
 
             for comp in ["E", "N"]:
                 if comp not in components:
@@ -182,16 +190,19 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
                 fac_1 = fac_1_map[comp](coordinates.phi)
                 fac_2 = fac_2_map[comp](coordinates.phi)
 
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final += strain_x[:, 0] * mij[0] * 1.0 * fac_1
-                final += strain_x[:, 1] * mij[1] * 1.0 * fac_1
-                final += strain_x[:, 2] * mij[2] * 1.0 * fac_1
-                final += strain_x[:, 3] * mij[3] * 2.0 * fac_2
-                final += strain_x[:, 4] * mij[4] * 2.0 * fac_1
-                final += strain_x[:, 5] * mij[5] * 2.0 * fac_2
+                weights = mij * [
+                    fac_1,
+                    fac_1,
+                    fac_1,
+                    2.0 * fac_2,
+                    2.0 * fac_1,
+                    2.0 * fac_2,
+                ]
                 if comp == "N":
-                    final *= -1.0
-                data[comp] = final
+                    weights *= -1.0
+                horizontal[comp] = weights
+
+            data.update(_apply_weights(strain_x, horizontal))
 
         elif isinstance(source, ForceSource):
             if self.info.dump_type != "displ_only":  # pragma: no cover
@@ -223,21 +234,15 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
             force /= self.parsed_mesh.amplitude
 
             if "Z" in components:
-                final = np.zeros(displ_z.shape[0], dtype="float64")
-                final += displ_z[:, 0] * force[0]
-                final += displ_z[:, 2] * force[2]
-                data["Z"] = final
+                weights = force * [1.0, 0.0, 1.0]
+                data["Z"] = np.dot(displ_z, weights)
 
+            horizontal = {}
             if "R" in components:
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 0] * force[0]
-                final += displ_x[:, 2] * force[2]
-                data["R"] = final
+                horizontal["R"] = force * [1.0, 0.0, 1.0]
 
             if "T" in components:
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 1] * force[1]
-                data["T"] = final
+                horizontal["T"] = force * [0.0, 1.0, 0.0]
 
             for comp in ["E", "N"]:
                 if comp not in components:
@@ -246,13 +251,12 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
                 fac_1 = fac_1_map[comp](coordinates.phi)
                 fac_2 = fac_2_map[comp](coordinates.phi)
 
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 0] * force[0] * fac_1
-                final += displ_x[:, 1] * force[1] * fac_2
-                final += displ_x[:, 2] * force[2] * fac_1
+                weights = force * [fac_1, fac_2, fac_1]
                 if comp == "N":
-                    final *= -1.0
-                data[comp] = final
+                    weights *= -1.0
+                horizontal[comp] = weights
+
+            data.update(_apply_weights(displ_x, horizontal))
 
         else:
             raise NotImplementedError
@@ -263,13 +267,10 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
         # We can now read it in a single go!
         utemp = self.meshes.merged.f["MergedSnapshots"][id_elem]
 
-        # utemp is currently (nvars, jpol, ipol, npts)
-        # 1. Roll to (npts, nvar, jpol, ipol)
-        utemp = np.rollaxis(utemp, 3, 0)
-        # 2. Roll to (npts, jpol, nvar, ipol)
-        utemp = np.rollaxis(utemp, 2, 1)
-        # 3. Roll to (npts, jpol, ipol, nvar)
-        utemp = np.rollaxis(utemp, 3, 2)
+        # utemp is currently (nvars, jpol, ipol, npts) - reorder to
+        # (npts, jpol, ipol, nvar). This is just a view - the callers copy it
+        # to the memory layout they require.
+        utemp = utemp.transpose(3, 1, 2, 0)
 
         return utemp
 
@@ -288,7 +289,8 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
         eta,
     ):
         mesh = self.meshes.merged
-        if id_elem not in mesh.strain_buffer:
+
+        def compute_strain():
             utemp = self._get_and_reorder_utemp(id_elem)
 
             strain_fct_map = {
@@ -356,9 +358,9 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
             else:
                 strain_z = None
 
-            mesh.strain_buffer.add(id_elem, (strain_x, strain_z))
-        else:
-            strain_x, strain_z = mesh.strain_buffer.get(id_elem)
+            return strain_x, strain_z
+
+        strain_x, strain_z = mesh.get_strain(id_elem, compute_strain)
 
         all_strains = {}
         for name, strain in (("strain_x", strain_x), ("strain_z", strain_z)):
@@ -383,12 +385,10 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
     def _get_displacement(
         self, id_elem, gll_point_ids, col_points_xi, col_points_eta, xi, eta
     ):
-        mesh = self.meshes.merged
-        if id_elem not in mesh.displ_buffer:
-            utemp = self._get_and_reorder_utemp(id_elem)
-            mesh.displ_buffer.add(id_elem, utemp)
-        else:
-            utemp = mesh.displ_buffer.get(id_elem)
+        # Buffered as (jpol, ipol, nvar, npts) - reorder to
+        # (npts, jpol, ipol, nvar).
+        utemp = self.meshes.merged.get_merged_element(id_elem)
+        utemp = utemp.transpose(3, 0, 1, 2)
 
         final_displacement_x = np.empty((utemp.shape[0], 3), order="F")
         utemp_x = utemp[:, :, :, :3]
@@ -198,15 +198,25 @@ def rotate_vector_src_to_xyz(vec, phi):
     )
 
 
-def rotate_vector_src_to_NEZ(  # NOQA
-    vec, phi, srclon, srccolat, reclon, reccolat
-):
+def rotmat_src_to_NEZ(phi, srclon, srccolat, reclon, reccolat):  # NOQA
+    """
+    Returns the 3x3 matrix rotating a vector from s, phi, z coordinates in
+    the source system to N, E, Z at the receiver.
+    """
     rotmat = np.eye(3)
     rotmat = rotate_vector_src_to_xyz(rotmat, phi)
     rotmat = rotate_vector_xyz_src_to_xyz_earth(rotmat, srclon, srccolat)
     rotmat = rotate_vector_xyz_earth_to_xyz_src(rotmat, reclon, reccolat)
     rotmat[0, :] *= -1  # N = - theta
 
+    return rotmat
+
+
+def rotate_vector_src_to_NEZ(  # NOQA
+    vec, phi, srclon, srccolat, reclon, reccolat
+):
+    rotmat = rotmat_src_to_NEZ(phi, srclon, srccolat, reclon, reccolat)
+
     return np.dot(rotmat, vec)
 
 
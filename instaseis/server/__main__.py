@@ -12,7 +12,57 @@ Launch Instaseis server.
 import argparse  # pragma: no cover
 import os  # pragma: no cover
 
-from instaseis.server.app import launch_io_loop  # pragma: no cover
+import threadpoolctl  # pragma: no cover
+
+# Environment variables controlling the size of the thread pools of the
+# numerical libraries and the threadpoolctl API each of them applies to.
+BLAS_THREAD_VARIABLES = {
+    "OPENBLAS_NUM_THREADS": "openblas",
+    "MKL_NUM_THREADS": "mkl",
+    "OMP_NUM_THREADS": "openmp",
+}
+
+
+def _parse_num_threads(value):  # pragma: no cover
+    """
+    Parse the value of one of the thread environment variables. OpenMP
+    also allows a list for nested parallelism, e.g. ``"4,2"`` - the first
+    value is the one for the outermost level. Returns None for values that
+    cannot be parsed.
+    """
+    try:
+        return int(value.split(",")[0])
+    except ValueError:
+        return None
+
+
+def limit_blas_threads(blas_threads=None):  # pragma: no cover
+    """
+    Limit the number of threads used by BLAS and OpenMP.
+
+    The server already serves requests concurrently - the Tornado IOLoop
+    hands them to a pool of worker threads. If every one of these also
+    starts one BLAS thread per core the machine is heavily oversubscribed,
+    so by default each request only uses a single BLAS thread.
+
+    :param blas_threads: The number of threads. If not given, already set
+        environment variables are honored and all others default to 1.
+    """
+    limits = {}
+    for var, api in BLAS_THREAD_VARIABLES.items():
+        if blas_threads is None:
+            os.environ.setdefault(var, "1")
+        else:
+            os.environ[var] = str(blas_threads)
+        num_threads = _parse_num_threads(os.environ[var])
+        if num_threads is not None:
+            limits[api] = num_threads
+
+    # The environment variables only take effect for libraries loaded from
+    # now on. NumPy and its BLAS are already loaded when importing
+    # instaseis, so adjust the running thread pools as well.
+    threadpoolctl.threadpool_limits(limits=limits)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -49,8 +99,23 @@ if __name__ == "__main__":
         choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"],
         help="The log level for all Tornado loggers.",
     )
+    parser.add_argument(
+        "--blas-threads",
+        type=int,
+        default=None,
+        help="Number of threads used by BLAS/OpenMP for each request. "
+        "Requests are already processed in parallel so this defaults to "
+        "the value of the respective environment variables or 1 if not set.",
+    )
 
     args = parser.parse_args()
+
+    # Must happen before the server and thus most of the numerical
+    # libraries are imported.
+    limit_blas_threads(blas_threads=args.blas_threads)
+
+    from instaseis.server.app import launch_io_loop
+
     db_path = os.path.abspath(args.db_path)
 
     launch_io_loop(
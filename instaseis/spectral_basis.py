@@ -12,6 +12,8 @@ AxiSEM's kernel module.
     (http://www.gnu.org/copyleft/lgpl.html)
 """
 import ctypes as C
+import functools
+
 import numpy as np
 
 from .helpers import load_lib
@@ -51,3 +53,118 @@ def lagrange_interpol_2D_td(points1, points2, coefficients, x1, x2):  # NOQA
         interpolant.ctypes.data_as(C.POINTER(C.c_double)),
     )
     return interpolant
+
+
+def lagrange_weighted_sum(weights1, weights2, coefficients, out):
+    """
+    Interpolate all values at the collocation points at once, e.g. all
+    variables and samples of an element, with the given Lagrange weights.
+
+    Equivalent to ``np.einsum("a,b,ab...->...", weights1, weights2,
+    coefficients)``. Single precision coefficients whose values at each
+    collocation point are contiguous in memory, like the elements of merged
+    databases or slices of their variable axis, are summed up with a
+    compiled kernel. Everything else is computed as a single matrix-vector
+    product with NumPy.
+
+    :param weights1: The weights for the first axis of ``coefficients``.
+    :param weights2: The weights for the second axis of ``coefficients``.
+    :param coefficients: Array of shape ``(N + 1, N + 1, ...)``.
+    :param out: C-contiguous output array with the shape of the trailing
+        axes of ``coefficients``. Single or double precision.
+    """
+    n = len(weights1) - 1
+    kernel = {
+        np.dtype(np.float64): lib.lagrange_weighted_sum_dp,
+        np.dtype(np.float32): lib.lagrange_weighted_sum_sp,
+    }.get(out.dtype)
+
+    itemsize = coefficients.itemsize
+    if (
+        kernel is None
+        or coefficients.dtype != np.float32
+        or coefficients.shape[:2] != (n + 1, n + 1)
+        or len(weights2) != n + 1
+        or not out.flags.c_contiguous
+        or out.shape != coefficients.shape[2:]
+        or not coefficients[0, 0].flags.c_contiguous
+        or coefficients.strides[1] % itemsize
+        or coefficients.strides[0] != (n + 1) * coefficients.strides[1]
+        or coefficients.strides[1] // itemsize < out.size
+    ):
+        # Flatten the collocation points so BLAS does the work. Reshaping
+        # copies coefficients that are not contiguous.
+        w = np.multiply.outer(weights1, weights2).reshape(-1)
+        values = coefficients.reshape(w.size, -1)
+        np.copyto(
+            out, np.dot(w, values).reshape(out.shape), casting="same_kind"
+        )
+        return out
+
+    weights1 = np.require(weights1, dtype=np.float64)
+    weights2 = np.require(weights2, dtype=np.float64)
+
+    # The compiled kernel works on Fortran ordered data so the roles of the
+    # two spatial axes are swapped.
+    kernel(
+        C.c_int(n),
+        C.c_int(out.size),
+        C.c_int(coefficients.strides[1] // itemsize),
+        weights2.ctypes.data_as(C.POINTER(C.c_double)),
+        weights1.ctypes.data_as(C.POINTER(C.c_double)),
+        coefficients.ctypes.data_as(C.POINTER(C.c_float)),
+        out.ctypes.data_as(C.c_void_p),
+    )
+    return out
+
+
+def lagrange_weights_1D(points, x):  # NOQA
+    """
+    Evaluate all 1D Lagrange basis polynomials defined on the given
+    collocation points at ``x``.
+
+    The weights are identical to the ones computed internally by
+    :func:`lagrange_interpol_2D_td`, so the 2D interpolation of any number of
+    coefficient arrays can reuse them.
+
+    :param points: The collocation points.
+    :param x: The point at which to evaluate the basis polynomials.
+    :returns: Array of shape ``(len(points),)``.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factors = (x - points)[np.newaxis, :] / (
+            points[:, np.newaxis] - points[np.newaxis, :]
+        )
+    np.fill_diagonal(factors, 1.0)
+    return factors.prod(axis=1)
+
+
+# Only exactly repeated positions hit the cache, e.g. a fixed
+# source-receiver geometry. Keep it small (roughly 1 kB per entry) so it
+# does not grow unbounded in a long running server.
+@functools.lru_cache(maxsize=1024)
+def _lagrange_weights(points1, points2, x1, x2):
+    w1 = lagrange_weights_1D(points1, x1)
+    w2 = lagrange_weights_1D(points2, x2)
+    # Cached values are shared - make sure they cannot be modified.
+    w1.flags.writeable = False
+    w2.flags.writeable = False
+    return w1, w2
+
+
+def lagrange_weights(points1, points2, x1, x2):
+    """
+    Cached Lagrange basis weights for the 2D tensor product interpolation at
+    ``(x1, x2)``.
+
+    The weights only depend on the collocation points and the position
+    within the element, so repeated extractions at the same position, e.g.
+    for a fixed source-receiver pair, don't have to recompute them.
+
+    :returns: Tuple of two read-only arrays, the weights along the first and
+        along the second axis.
+    """
+    return _lagrange_weights(
+        tuple(points1), tuple(points2), float(x1), float(x2)
+    )
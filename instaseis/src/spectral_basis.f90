@@ -8,7 +8,7 @@
 
 module spectral_basis
     use global_parameters, only: sp, dp, pi
-    use iso_c_binding, only: c_double, c_int
+    use iso_c_binding, only: c_double, c_float, c_int
 
     implicit none
     private
@@ -34,6 +34,56 @@ subroutine lagrange_interpol_2D_td_wrapped(N, nsamp, points1, points2, coefficie
 end subroutine
 !-----------------------------------------------------------------------------------------
 
+!-----------------------------------------------------------------------------------------
+!> weighted sum of nblock long single precision blocks located at the collocation points,
+!  e.g. all variables and samples of an element of a merged database. Consecutive
+!  collocation points are ld values apart so only parts of an element can be used.
+subroutine lagrange_weighted_sum_dp(N, nblock, ld, weights1, weights2, coefficients, &
+                                    interpolant) &
+  bind(c, name="lagrange_weighted_sum_dp")
+
+  integer(c_int), intent(in), value  :: N, nblock, ld
+  real(c_double), intent(in)         :: weights1(0:N), weights2(0:N)
+  real(c_float), intent(in)          :: coefficients(1:ld, 0:N, 0:N)
+  real(c_double), intent(out)        :: interpolant(nblock)
+
+  integer                            :: i, j
+
+  interpolant(:) = 0
+
+  do j=0, N
+     do i=0, N
+        interpolant(:) = interpolant(:) &
+                         + coefficients(1:nblock,i,j) * (weights1(i) * weights2(j))
+     enddo
+  enddo
+end subroutine
+!-----------------------------------------------------------------------------------------
+
+!-----------------------------------------------------------------------------------------
+!> same as lagrange_weighted_sum_dp but accumulating in single precision
+subroutine lagrange_weighted_sum_sp(N, nblock, ld, weights1, weights2, coefficients, &
+                                    interpolant) &
+  bind(c, name="lagrange_weighted_sum_sp")
+
+  integer(c_int), intent(in), value  :: N, nblock, ld
+  real(c_double), intent(in)         :: weights1(0:N), weights2(0:N)
+  real(c_float), intent(in)          :: coefficients(1:ld, 0:N, 0:N)
+  real(c_float), intent(out)         :: interpolant(nblock)
+
+  integer                            :: i, j
+
+  interpolant(:) = 0
+
+  do j=0, N
+     do i=0, N
+        interpolant(:) = interpolant(:) &
+                         + coefficients(1:nblock,i,j) * real(weights1(i) * weights2(j), sp)
+     enddo
+  enddo
+end subroutine
+!-----------------------------------------------------------------------------------------
+
 !== END  C Wrappers ======================================================================
 
 !-----------------------------------------------------------------------------------------
@@ -40,3 +40,11 @@ def test_buffer():
     # Once more not in.
     assert "d" not in buf
     assert buf.efficiency == 2.0 / 4.0
+
+
+def test_buffer_replace_item():
+    buf = Buffer(max_size_in_mb=1.0)
+    buf.add("a", np.empty(10, dtype=np.int8))
+    buf.add("a", np.empty(20, dtype=np.int8))
+    assert buf._total_size == 20
+    assert buf.get("a").nbytes == 20
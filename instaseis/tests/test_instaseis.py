@@ -2274,7 +2274,257 @@ def test_merged_forward_database_layout():
                     components=("Z", "N", "E", "R", "T"),
                 )
 
-                assert st_fwd == st_fwd_m
+                # The merged layout interpolates all variables in a single
+                # contraction so results are only equal up to rounding.
+                assert len(st_fwd) == len(st_fwd_m)
+                for tr, tr_m in zip(st_fwd, st_fwd_m):
+                    assert tr.stats == tr_m.stats
+                    np.testing.assert_allclose(
+                        tr_m.data,
+                        tr.data,
+                        rtol=1e-7,
+                        atol=np.abs(tr.data).max() * 1e-10,
+                    )
+
+    # Requesting single components must not change the results.
+    for comp in ("Z", "N", "E", "R", "T"):
+        tr_m = fwd_db_m.get_seismograms(
+            source=source, receiver=receiver, components=(comp,)
+        )[0]
+        assert tr_m == st_fwd_m.select(component=comp)[0]
+
+
+@pytest.mark.skipif(
+    "merged_100s_db_fwd" not in _CONFIG_DBS["databases"],
+    reason="requires generated tests databases.",
+)
+def test_merged_database_read_element():
+    """
+    Elements are repacked to (jpol, ipol, nvar, npts) when read.
+    """
+    db = instaseis.open_db(_CONFIG_DBS["databases"]["merged_100s_db_fwd"])
+    m = db.parsed_mesh
+    ds = m.f["MergedSnapshots"]
+
+    for id_elem in (0, 10, 11):
+        expected = ds[id_elem].transpose(1, 2, 0, 3)
+        utemp = m.read_element(id_elem)
+        assert utemp.flags.c_contiguous
+        np.testing.assert_equal(utemp, expected)
+
+
+@pytest.mark.skipif(
+    "merged_100s_db_fwd" not in _CONFIG_DBS["databases"],
+    reason="requires generated tests databases.",
+)
+def test_merged_forward_database_sparse_moment_tensors():
+    """
+    Moment tensors with zero components skip parts of the interpolation in
+    the merged forward database. Make sure the results are unaffected.
+    """
+    fwd_db = instaseis.open_db(os.path.join(DATA, "100s_db_fwd"))
+    fwd_db_m = instaseis.open_db(
+        _CONFIG_DBS["databases"]["merged_100s_db_fwd"]
+    )
+
+    receiver = Receiver(latitude=10.0, longitude=20.0)
+    tensors = [
+        # Explosion.
+        dict(m_rr=1e17, m_tt=1e17, m_pp=1e17),
+        # Vertical strike-slip.
+        dict(m_tp=1e17),
+        # Vertical dip-slip.
+        dict(m_rt=1e17),
+        dict(m_rr=1e17, m_tt=-1e17),
+        # All zero.
+        dict(),
+    ]
+    for tensor in tensors:
+        source = Source(latitude=-10.0, longitude=50.0, **tensor)
+        st_fwd = fwd_db.get_seismograms(
+            source=source,
+            receiver=receiver,
+            components=("Z", "N", "E", "R", "T"),
+        )
+        st_fwd_m = fwd_db_m.get_seismograms(
+            source=source,
+            receiver=receiver,
+            components=("Z", "N", "E", "R", "T"),
+        )
+        for tr, tr_m in zip(st_fwd, st_fwd_m):
+            np.testing.assert_allclose(
+                tr_m.data,
+                tr.data,
+                rtol=1e-7,
+                atol=np.abs(tr.data).max() * 1e-10,
+            )
+
+
+@pytest.mark.skipif(
+    "merged_100s_db_fwd" not in _CONFIG_DBS["databases"],
+    reason="requires generated tests databases.",
+)
+def test_merged_forward_database_batched_extraction():
+    """
+    The batched extraction must give the same results as extracting every
+    source on its own.
+    """
+    db = instaseis.open_db(_CONFIG_DBS["databases"]["merged_100s_db_fwd"])
+    receiver = Receiver(latitude=10.0, longitude=20.0)
+    components = ("Z", "N", "E", "R", "T")
+
+    sources = [
+        Source(latitude=-10.0, longitude=50.0, m_rr=1e17, m_tp=-2e17),
+        Source(latitude=30.0, longitude=-20.0, m_tt=1e17, m_rp=2e17),
+        # Same location - thus same element - as the first source.
+        Source(latitude=-10.0, longitude=50.0, m_pp=3e17, m_rt=1e17),
+        Source(latitude=-10.05, longitude=50.05, m_rr=-1e17, m_tt=1e17),
+    ]
+    coordinates = [
+        db._get_coordinates(source=src, receiver=receiver) for src in sources
+    ]
+    element_info = [db._get_element_info(coordinates=c) for c in coordinates]
+    assert element_info[0].id_elem == element_info[2].id_elem
+
+    data = db._get_data_batch(
+        sources, receiver, components, coordinates, element_info
+    )
+
+    for _i, src in enumerate(sources):
+        single = db._get_data(
+            src, receiver, components, coordinates[_i], element_info[_i]
+        )
+        assert data["mu"][_i] == single["mu"]
+        for comp in components:
+            np.testing.assert_allclose(
+                data[comp][_i],
+                single[comp],
+                rtol=1e-10,
+                atol=np.abs(single[comp]).max() * 1e-12,
+            )
+
+    # Invalid inputs.
+    with pytest.raises(ValueError) as e:
+        db._get_data_batch([], receiver, components, [], [])
+    assert e.value.args[0] == "At least one source is required."
+    with pytest.raises(ValueError) as e:
+        db._get_data_batch(
+            sources, receiver, components, coordinates[:2], element_info
+        )
+    assert e.value.args[0] == (
+        "sources, coordinates, and element_info must have the same length."
+    )
+
+
+@pytest.mark.skipif(
+    "merged_100s_db_fwd" not in _CONFIG_DBS["databases"],
+    reason="requires generated tests databases.",
+)
+def test_merged_forward_database_fp32():
+    """
+    Single precision extraction must closely match the default double
+    precision one.
+    """
+    path = _CONFIG_DBS["databases"]["merged_100s_db_fwd"]
+    db = instaseis.open_db(path)
+    db_32 = instaseis.open_db(path, fp32=True)
+    assert db.dtype == np.float64
+    assert db_32.dtype == np.float32
+
+    receiver = Receiver(latitude=10.0, longitude=20.0)
+    source = Source(
+        latitude=-10.0,
+        longitude=50.0,
+        m_rr=4.71e17,
+        m_tt=3.81e15,
+        m_pp=-4.74e17,
+        m_rt=3.99e16,
+        m_rp=-8.05e16,
+        m_tp=-1.23e17,
+    )
+    components = ("Z", "N", "E", "R", "T")
+
+    st = db.get_seismograms(
+        source=source, receiver=receiver, components=components
+    )
+    st_32 = db_32.get_seismograms(
+        source=source, receiver=receiver, components=components
+    )
+    for tr, tr_32 in zip(st, st_32):
+        np.testing.assert_allclose(
+            tr_32.data, tr.data, rtol=0, atol=np.abs(tr.data).max() * 1e-6
+        )
+
+    # Same for the batched extraction.
+    coordinates = [db_32._get_coordinates(source=source, receiver=receiver)]
+    element_info = [db_32._get_element_info(coordinates=coordinates[0])]
+    data = db._get_data_batch(
+        [source], receiver, components, coordinates, element_info
+    )
+    data_32 = db_32._get_data_batch(
+        [source], receiver, components, coordinates, element_info
+    )
+    for comp in components:
+        assert data_32[comp].dtype == np.float32
+        np.testing.assert_allclose(
+            data_32[comp],
+            data[comp],
+            rtol=0,
+            atol=np.abs(data[comp]).max() * 1e-6,
+        )
+
+
+@pytest.mark.skipif(
+    "merged_100s_db_bwd_displ_only" not in _CONFIG_DBS["databases"],
+    reason="requires generated tests databases.",
+)
+def test_merged_database_concurrent_extraction():
+    """
+    The buffers of merged databases are shared by all threads extracting
+    seismograms, e.g. in the server. Use a tiny buffer so items are
+    constantly evicted while other threads access them.
+    """
+    import concurrent.futures
+
+    path = _CONFIG_DBS["databases"]["merged_100s_db_bwd_displ_only"]
+    db = instaseis.open_db(path)
+    db_shared = instaseis.open_db(path, buffer_size_in_mb=0.05)
+
+    source = Source(
+        latitude=4.0, longitude=3.0, depth_in_m=0, m_rr=4.71e17, m_tt=3.81e15
+    )
+    receivers = [
+        Receiver(latitude=lat, longitude=lng)
+        for lat in range(-60, 61, 30)
+        for lng in range(-120, 121, 60)
+    ]
+
+    def extract(receiver):
+        return db_shared.get_seismograms(source=source, receiver=receiver)
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(extract, receivers * 3))
+
+    for receiver, st in zip(receivers * 3, results):
+        expected = db.get_seismograms(source=source, receiver=receiver)
+        for tr, tr_expected in zip(st, expected):
+            np.testing.assert_array_equal(tr.data, tr_expected.data)
+
+
+def test_fp32_not_supported_for_other_databases():
+    """
+    Only merged forward databases can extract in single precision.
+    """
+    for path in [
+        os.path.join(DATA, "100s_db_fwd"),
+        os.path.join(DATA, "100s_db_bwd_displ_only"),
+    ]:
+        with pytest.raises(NotImplementedError) as e:
+            instaseis.open_db(path, fp32=True)
+        assert e.value.args[0] == (
+            "Single precision extraction is only supported for merged "
+            "forward databases."
+        )
 
 
 @pytest.mark.parametrize("bwd_db", BW_DISPL_DBS)
@@ -204,6 +204,28 @@ def test_rotate_vector_xyz_src_to_xyz_rec():
     np.testing.assert_allclose(wref, w, atol=1e-10)
 
 
+def test_rotmat_src_to_NEZ():  # NOQA
+    args = (
+        np.radians(30.0),
+        np.radians(20.0),
+        np.radians(40.0),
+        np.radians(-50.0),
+        np.radians(70.0),
+    )
+    rotmat = rotations.rotmat_src_to_NEZ(*args)
+
+    # Must be orthogonal.
+    np.testing.assert_allclose(np.dot(rotmat, rotmat.T), np.eye(3), atol=1e-12)
+
+    # And identical to rotating the vectors.
+    v = np.array([[1.0, 2.0], [2.0, -3.0], [3.0, 0.5]])
+    np.testing.assert_allclose(
+        np.dot(rotmat, v),
+        rotations.rotate_vector_src_to_NEZ(v, *args),
+        atol=1e-12,
+    )
+
+
 def test_coord_transform_lat_lon_depth_to_xyz():
     latitude, longitude, depth_in_m = 0.0, 0.0, 0.0
     xyz = rotations.coord_transform_lat_lon_depth_to_xyz(
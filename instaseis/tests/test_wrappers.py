@@ -12,7 +12,7 @@ Mostly testing the various wrappers.
 import numpy as np
 
 
-from instaseis import finite_elem_mapping, rotations
+from instaseis import finite_elem_mapping, rotations, spectral_basis
 
 
 def test_rotate_frame_rd():
@@ -214,3 +214,90 @@ def test_inside_element():
         xi_ref=-0.7846998127497518,
         eta_ref=-0.8109601156061497,
     )
+
+
+def test_lagrange_weights_1D():  # NOQA
+    """
+    The 1D weights must reproduce the 2D interpolation.
+    """
+    points = np.array([-1.0, -0.6546536707, 0.0, 0.6546536707, 1.0])
+    np.random.seed(12345)
+    coefficients = np.random.random((20, 5, 5))
+    xi, eta = 0.3, -0.7
+
+    w_xi = spectral_basis.lagrange_weights_1D(points, xi)
+    w_eta = spectral_basis.lagrange_weights_1D(points, eta)
+
+    # Partition of unity and interpolation property.
+    assert abs(w_xi.sum() - 1.0) < 1e-12
+    np.testing.assert_allclose(
+        spectral_basis.lagrange_weights_1D(points, points[1]),
+        [0.0, 1.0, 0.0, 0.0, 0.0],
+        atol=1e-12,
+    )
+
+    np.testing.assert_allclose(
+        np.einsum("a,b,tab->t", w_xi, w_eta, coefficients),
+        spectral_basis.lagrange_interpol_2D_td(
+            points, points, coefficients, xi, eta
+        ),
+        rtol=1e-12,
+    )
+
+
+def test_lagrange_weights():
+    points = np.array([-1.0, -0.6546536707, 0.0, 0.6546536707, 1.0])
+
+    w_xi, w_eta = spectral_basis.lagrange_weights(points, points, 0.3, -0.7)
+    np.testing.assert_equal(
+        w_xi, spectral_basis.lagrange_weights_1D(points, 0.3)
+    )
+    np.testing.assert_equal(
+        w_eta, spectral_basis.lagrange_weights_1D(points, -0.7)
+    )
+
+    # Cached and read-only.
+    w = spectral_basis.lagrange_weights(points, points, 0.3, -0.7)
+    assert w[0] is w_xi
+    assert w[1] is w_eta
+    assert not w_xi.flags.writeable
+
+
+def test_lagrange_weighted_sum():
+    points = np.array([-1.0, -0.6546536707, 0.0, 0.6546536707, 1.0])
+    w_xi, w_eta = spectral_basis.lagrange_weights(points, points, 0.3, -0.7)
+
+    np.random.seed(12345)
+    # Layout of the elements of merged databases.
+    coefficients = np.random.random((5, 5, 10, 20)).astype(np.float32)
+
+    # Full element, part of the variables, and a non-contiguous slice
+    # which is handled by NumPy.
+    for coeffs in [
+        coefficients,
+        coefficients[:, :, 4:7],
+        coefficients[:, :, :, ::2],
+        coefficients.astype(np.float64),
+    ]:
+        expected = np.einsum(
+            "a,b,abkt->kt", w_xi, w_eta, coeffs.astype(np.float64)
+        )
+        out = np.empty(coeffs.shape[2:], dtype=np.float64)
+        spectral_basis.lagrange_weighted_sum(w_xi, w_eta, coeffs, out=out)
+        np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+        out = np.empty(coeffs.shape[2:], dtype=np.float32)
+        spectral_basis.lagrange_weighted_sum(w_xi, w_eta, coeffs, out=out)
+        np.testing.assert_allclose(out, expected, rtol=1e-5)
+
+    # Must be identical to the Fortran interpolation of single variables.
+    out = np.empty((10, 20), dtype=np.float64)
+    spectral_basis.lagrange_weighted_sum(w_xi, w_eta, coefficients, out=out)
+    expected = spectral_basis.lagrange_interpol_2D_td(
+        points,
+        points,
+        coefficients[:, :, 3].astype(np.float64).transpose(2, 0, 1),
+        0.3,
+        -0.7,
+    )
+    np.testing.assert_allclose(out[3], expected, rtol=1e-12)
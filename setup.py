@@ -161,6 +161,7 @@ INSTALL_REQUIRES = [
     "requests",
     "geographiclib",
     "jsonschema >= 2.4.0",
+    "threadpoolctl",
 ]
 
 EXTRAS_REQUIRE = {